@@ -1,59 +1,327 @@
-import json
+import asyncio
+import atexit
+import hashlib
 import logging
 import os
+import pickle
+import queue
 import sys
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Tuple
+from collections import OrderedDict
+from logging.handlers import QueueHandler, QueueListener
 import warnings
 
-import requests
+import httpx
+import orjson
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.server.models import InitializationOptions
 from mcp.types import TextContent, Tool, JSONRPCError, ErrorData, ServerCapabilities
 
-# Set up unbuffered output
+_CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'config.json')
+
+# Set up unbuffered output. The streams themselves are not reopened: the
+# MCP stdio transport re-wraps sys.stdout.buffer and flushes every message,
+# and the log StreamHandler flushes every record.
 os.environ['PYTHONUNBUFFERED'] = '1'
-sys.stdout = os.fdopen(sys.stdout.fileno(), 'w', 1)
-sys.stderr = os.fdopen(sys.stderr.fileno(), 'w', 1)
 
-# Set up logging
+# Set up logging. Records are formatted by the QueueHandler and written
+# by a background thread, so the event loop never blocks on log I/O.
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(
+    _log_queue,
+    logging.StreamHandler(sys.stderr),
+    logging.FileHandler(os.path.expanduser('~/.claude-mcp-servers/ai-assistant/server.log'), mode='a')
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logging.basicConfig(
     level=logging.DEBUG if os.getenv('DEBUG', '0') == '1' else logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stderr),
-        logging.FileHandler(os.path.expanduser('~/.claude-mcp-servers/ai-assistant/server.log'), mode='a')
-    ]
+    handlers=[QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
 # Suppress specific warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning, module="pydantic")
 
+# Tool definitions; the model property is filled in from config.json
+_MODEL_PROPERTY = {
+    "type": "string",
+    "description": "Model to use: {models}"
+}
+
+_TOOL_SCHEMAS = [
+    {
+        "name": "pair",
+        "description": "Collaborate with AI on any topic - ask questions, brainstorm ideas, or work through problems together",
+        "properties": {
+            "prompt": {
+                "type": "string",
+                "description": "Your question or topic to discuss"
+            },
+            "model": _MODEL_PROPERTY,
+            "temperature": {
+                "type": "number",
+                "description": "Response creativity (0.0-1.0)",
+                "default": 0.5
+            }
+        },
+        "required": ["prompt"]
+    },
+    {
+        "name": "review",
+        "description": "Get comprehensive code review with actionable feedback",
+        "properties": {
+            "code": {
+                "type": "string",
+                "description": "Code to review"
+            },
+            "context": {
+                "type": "string",
+                "description": "Additional context about the code",
+                "default": ""
+            },
+            "model": _MODEL_PROPERTY
+        },
+        "required": ["code"]
+    },
+    {
+        "name": "brainstorm",
+        "description": "Brainstorm creative solutions and explore ideas",
+        "properties": {
+            "topic": {
+                "type": "string",
+                "description": "Topic to brainstorm about"
+            },
+            "constraints": {
+                "type": "string",
+                "description": "Any constraints or requirements",
+                "default": ""
+            },
+            "model": _MODEL_PROPERTY
+        },
+        "required": ["topic"]
+    },
+    {
+        "name": "review_performance",
+        "description": "Analyze code for performance issues and optimization opportunities",
+        "properties": {
+            "code": {
+                "type": "string",
+                "description": "Code to analyze for performance"
+            },
+            "context": {
+                "type": "string",
+                "description": "Context about expected usage patterns",
+                "default": ""
+            },
+            "model": _MODEL_PROPERTY
+        },
+        "required": ["code"]
+    },
+    {
+        "name": "review_security",
+        "description": "Security-focused code review to identify vulnerabilities",
+        "properties": {
+            "code": {
+                "type": "string",
+                "description": "Code to analyze for security issues"
+            },
+            "context": {
+                "type": "string",
+                "description": "Security context or requirements",
+                "default": ""
+            },
+            "model": _MODEL_PROPERTY
+        },
+        "required": ["code"]
+    }
+]
+
+# Prompt templates, filled in with str.format_map
+_REVIEW_TEMPLATE = """Please provide a comprehensive code review for the following code.
+
+Context: {context}
+
+Code to review:
+```
+{code}
+```
+
+Please analyze:
+1. Code quality and readability
+2. Potential bugs or issues
+3. Performance considerations
+4. Security concerns
+5. Best practices and improvements
+6. Overall architecture and design
+
+Provide specific, actionable feedback with examples where appropriate."""
+
+_BRAINSTORM_TEMPLATE = """Let's brainstorm creative ideas and solutions for: {topic}
+
+{constraints}
+
+Please provide:
+1. Multiple creative approaches or solutions
+2. Pros and cons of each approach
+3. Unconventional or innovative ideas
+4. Practical implementation considerations
+5. Potential challenges and how to address them
+
+Be creative and think outside the box!"""
+
+_PERFORMANCE_TEMPLATE = """Please analyze the following code for performance issues and optimization opportunities.
+
+Usage context: {context}
+
+Code to analyze:
+```
+{code}
+```
+
+Please identify:
+1. Performance bottlenecks
+2. Time complexity analysis
+3. Space complexity concerns
+4. Optimization opportunities
+5. Caching strategies
+6. Algorithm improvements
+7. Resource usage concerns
+
+Provide specific recommendations with code examples where applicable."""
+
+_SECURITY_TEMPLATE = """Please perform a security-focused review of the following code.
+
+Security context: {context}
+
+Code to analyze:
+```
+{code}
+```
+
+Please identify:
+1. Security vulnerabilities (injection, XSS, etc.)
+2. Authentication/authorization issues
+3. Data validation concerns
+4. Cryptographic weaknesses
+5. Information disclosure risks
+6. OWASP Top 10 considerations
+7. Security best practices violations
+
+Provide specific vulnerabilities with severity levels and remediation recommendations."""
+
+# Tool name -> (prompt template, temperature)
+_TEMPLATES = {
+    "review": (_REVIEW_TEMPLATE, 0.3),
+    "brainstorm": (_BRAINSTORM_TEMPLATE, 0.7),
+    "review_performance": (_PERFORMANCE_TEMPLATE, 0.3),
+    "review_security": (_SECURITY_TEMPLATE, 0.2),
+}
+
+# Connection pool limits for the shared OpenRouter client
+_MAX_CONNECTIONS = 20
+_MAX_KEEPALIVE_CONNECTIONS = 10
+
+# Seconds an idle pooled connection to OpenRouter is kept open
+_KEEPALIVE_EXPIRY = 120.0
+
+# Maximum number of responses kept by the in-memory response cache
+_RESPONSE_CACHE_SIZE = 256
+
+# Code review tools -> context used when none is provided
+_CONTEXT_DEFAULTS = {
+    "review": "No additional context provided",
+    "review_performance": "General purpose usage",
+    "review_security": "Standard security requirements",
+}
+
 class AIAssistantMCPServer:
     """MCP Server for AI Assistant using OpenRouter"""
     
+    # Parsed configs keyed by path, validated against (mtime_ns, size)
+    _config_cache: Dict[str, Tuple[Tuple[int, int], dict]] = {}
+    _config_cache_file = os.path.expanduser('~/.claude-mcp-servers/ai-assistant/config.cache.pkl')
+    
     def __init__(self):
         self.server = Server("ai-assistant")
         self.config = self._load_config()
         self.api_key = self._get_api_key()
-        self.base_url = "https://openrouter.ai/api/v1/chat/completions"
+        self.base_url = "https://openrouter.ai/api/v1/"
+        self._static_headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "https://github.com/claude-mcp/ai-assistant",
+            "X-Title": "AI Assistant MCP Server"
+        }
+        self._model_table: Dict[str, Tuple[str, Optional[int]]] = {
+            name: (cfg['model_id'], cfg.get('max_tokens'))
+            for name, cfg in self.config.get('models', {}).items()
+        }
+        self._model_names_str = ", ".join(self._model_table)
+        self._http: Optional[httpx.AsyncClient] = None
+        self._max_concurrency = self.config.get('max_concurrency', 10)
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._default_model = self.config.get('default_model', 'Gemini')
+        self._default_temperature = 0.5
+        self._cache_responses = self.config.get('cache_responses', True)
+        self._resp_cache: "OrderedDict[Tuple[str, float, int, bytes], str]" = OrderedDict()
         self._setup_tools()
         self._setup_handlers()
         logger.info("AI Assistant MCP Server initialized")
     
     def _load_config(self) -> dict:
         """Load configuration from config.json"""
-        config_path = os.path.join(os.path.dirname(__file__), 'config.json')
         try:
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-                logger.info("Configuration loaded successfully")
-                return config
+            st = os.stat(_CONFIG_PATH)
+            key = (st.st_mtime_ns, st.st_size)
+            cached = self._config_cache.get(_CONFIG_PATH)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            
+            config = self._read_config_cache(_CONFIG_PATH, key)
+            if config is None:
+                with open(_CONFIG_PATH, 'rb') as f:
+                    config = orjson.loads(f.read())
+                self._write_config_cache(_CONFIG_PATH, key, config)
+            
+            self._config_cache[_CONFIG_PATH] = (key, config)
+            logger.info("Configuration loaded successfully")
+            return config
         except Exception as e:
             logger.error(f"Failed to load config: {str(e)}")
             raise RuntimeError("Configuration file is required")
     
+    def _read_config_cache(self, config_path: str, key: Tuple[int, int]) -> Optional[dict]:
+        """Return the on-disk cached config if it matches config_path and key"""
+        try:
+            with open(self._config_cache_file, 'rb') as f:
+                entry = pickle.load(f)
+        except Exception:
+            return None
+        if not isinstance(entry, dict) or not isinstance(entry.get('config'), dict):
+            return None
+        if entry.get('path') != config_path or entry.get('key') != key:
+            return None
+        logger.debug("Configuration loaded from cache")
+        return entry.get('config')
+    
+    def _write_config_cache(self, config_path: str, key: Tuple[int, int], config: dict):
+        """Atomically write the parsed config to the on-disk cache"""
+        tmp_path = f"{self._config_cache_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({'path': config_path, 'key': key, 'config': config}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._config_cache_file)
+        except Exception as e:
+            logger.debug(f"Could not write config cache: {str(e)}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    
     def _get_api_key(self) -> str:
         """Get OpenRouter API key"""
         api_key = os.getenv(self.config.get('api_key_env', 'OPENROUTER_API_KEY'))
@@ -65,20 +333,21 @@ class AIAssistantMCPServer:
     
     async def _call_openrouter(self, prompt: str, model: str, temperature: float = 0.3, max_tokens: int = 4096) -> str:
         """Make API call to OpenRouter"""
-        if model not in self.config.get('models', {}):
-            available = ", ".join(self.config.get('models', {}).keys())
-            raise ValueError(f"Model '{model}' not available. Available models: {available}")
+        entry = self._model_table.get(model)
+        if entry is None:
+            raise ValueError(f"Model '{model}' not available. Available models: {self._model_names_str}")
         
-        model_config = self.config['models'][model]
-        model_id = model_config['model_id']
-        supports_images = model_config.get('supports_images', False)
+        model_id, model_max_tokens = entry
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://github.com/claude-mcp/ai-assistant",
-            "X-Title": "AI Assistant MCP Server"
-        }
+        cache_key = None
+        if self._cache_responses:
+            digest = hashlib.blake2b(prompt.encode('utf-8'), digest_size=16).digest()
+            cache_key = (model, temperature, max_tokens, digest)
+            cached = self._resp_cache.get(cache_key)
+            if cached is not None:
+                self._resp_cache.move_to_end(cache_key)
+                logger.debug("OpenRouter response served from cache - Model: %s", model)
+                return cached
         
         # For now, we'll use simple text format for all models
         # Future enhancement: Add image support based on supports_images flag
@@ -86,17 +355,30 @@ class AIAssistantMCPServer:
             "model": model_id,
             "messages": [{"role": "user", "content": prompt}],
             "temperature": temperature,
-            "max_tokens": model_config.get('max_tokens', max_tokens)
+            "max_tokens": model_max_tokens if model_max_tokens is not None else max_tokens,
+            "stream": True
         }
         
-        logger.debug(f"OpenRouter request - Model: {model} ({model_id}), Temperature: {temperature}")
+        logger.debug("OpenRouter request - Model: %s (%s), Temperature: %s", model, model_id, temperature)
         
         try:
-            response = requests.post(self.base_url, headers=headers, json=data, timeout=120)
-            response.raise_for_status()
-            result = response.json()
-            content = result['choices'][0]['message']['content']
-            logger.debug(f"OpenRouter response received - Length: {len(content)}")
+            # Created on first use so startup (and list_tools) does not pay
+            # for the HTTP/2 stack; no await between check and assignment
+            if self._http is None:
+                self._http = self._create_http_client()
+            if self._sem is None:
+                self._sem = asyncio.Semaphore(self._max_concurrency)
+            
+            # Concurrent tool calls share the client; cap in-flight requests
+            # to stay within OpenRouter rate limits
+            async with self._sem:
+                content = await self._stream_completion(data)
+            logger.debug("OpenRouter response received - Length: %d", len(content))
+            # Never cache an empty answer; retries should hit OpenRouter again
+            if cache_key is not None and content:
+                self._resp_cache[cache_key] = content
+                if len(self._resp_cache) > _RESPONSE_CACHE_SIZE:
+                    self._resp_cache.popitem(last=False)
             return content
         except Exception as e:
             logger.error(f"OpenRouter API error: {str(e)}")
@@ -104,135 +386,125 @@ class AIAssistantMCPServer:
                 logger.error(f"Response details: {e.response.text}")
             raise
     
+    async def _stream_completion(self, data: dict) -> str:
+        """POST a streaming completion request and assemble the SSE deltas"""
+        pieces = []
+        finished = False
+        async with self._http.stream("POST", "chat/completions", content=orjson.dumps(data)) as response:
+            if response.is_error:
+                # Load the body so the error details can be logged
+                await response.aread()
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                # Skip blank separators and keep-alive comments
+                if not line.startswith("data: "):
+                    continue
+                payload = line[6:]
+                if payload == "[DONE]":
+                    finished = True
+                    break
+                chunk = orjson.loads(payload)
+                if 'error' in chunk:
+                    raise RuntimeError(chunk['error'].get('message', 'Unknown streaming error'))
+                choices = chunk.get('choices')
+                if choices:
+                    pieces.append(choices[0].get('delta', {}).get('content') or '')
+                    if choices[0].get('finish_reason'):
+                        finished = True
+        if not finished:
+            raise RuntimeError("OpenRouter stream ended before the completion finished")
+        return "".join(pieces)
+    
+    def _create_http_client(self) -> httpx.AsyncClient:
+        """Create the shared HTTP client used for OpenRouter calls"""
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            # HTTP/2 multiplexes concurrent calls over one TLS connection
+            http2=True,
+            timeout=httpx.Timeout(120.0, connect=10.0),
+            headers=self._static_headers,
+            # Tool calls are often minutes apart; keep idle connections
+            # around longer than the 5s default so they get reused
+            limits=httpx.Limits(
+                max_connections=_MAX_CONNECTIONS,
+                max_keepalive_connections=_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=_KEEPALIVE_EXPIRY
+            )
+        )
+    
     def _setup_tools(self):
         """Set up available tools"""
-        available_models = ", ".join(self.config.get('models', {}).keys())
+        def build_property(key: str, prop: dict) -> dict:
+            if key != "model":
+                return prop
+            return {**prop, "description": prop["description"].format(models=self._model_names_str), "default": self._default_model}
         
+        # The schemas are static, so skip pydantic validation
         self.tools = [
-            Tool(
-                name="pair",
-                description="Collaborate with AI on any topic - ask questions, brainstorm ideas, or work through problems together",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "prompt": {
-                            "type": "string",
-                            "description": "Your question or topic to discuss"
-                        },
-                        "model": {
-                            "type": "string",
-                            "description": f"Model to use: {available_models}",
-                            "default": self.config.get('default_model', 'Gemini')
-                        },
-                        "temperature": {
-                            "type": "number",
-                            "description": "Response creativity (0.0-1.0)",
-                            "default": 0.5
-                        }
-                    },
-                    "required": ["prompt"]
-                }
-            ),
-            Tool(
-                name="review",
-                description="Get comprehensive code review with actionable feedback",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "code": {
-                            "type": "string",
-                            "description": "Code to review"
-                        },
-                        "context": {
-                            "type": "string",
-                            "description": "Additional context about the code",
-                            "default": ""
-                        },
-                        "model": {
-                            "type": "string",
-                            "description": f"Model to use: {available_models}",
-                            "default": self.config.get('default_model', 'Gemini')
-                        }
-                    },
-                    "required": ["code"]
-                }
-            ),
-            Tool(
-                name="brainstorm",
-                description="Brainstorm creative solutions and explore ideas",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "topic": {
-                            "type": "string",
-                            "description": "Topic to brainstorm about"
-                        },
-                        "constraints": {
-                            "type": "string",
-                            "description": "Any constraints or requirements",
-                            "default": ""
-                        },
-                        "model": {
-                            "type": "string",
-                            "description": f"Model to use: {available_models}",
-                            "default": self.config.get('default_model', 'Gemini')
-                        }
-                    },
-                    "required": ["topic"]
-                }
-            ),
-            Tool(
-                name="review_performance",
-                description="Analyze code for performance issues and optimization opportunities",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "code": {
-                            "type": "string",
-                            "description": "Code to analyze for performance"
-                        },
-                        "context": {
-                            "type": "string",
-                            "description": "Context about expected usage patterns",
-                            "default": ""
-                        },
-                        "model": {
-                            "type": "string",
-                            "description": f"Model to use: {available_models}",
-                            "default": self.config.get('default_model', 'Gemini')
-                        }
-                    },
-                    "required": ["code"]
-                }
-            ),
-            Tool(
-                name="review_security",
-                description="Security-focused code review to identify vulnerabilities",
+            Tool.model_construct(
+                name=schema["name"],
+                description=schema["description"],
                 inputSchema={
                     "type": "object",
-                    "properties": {
-                        "code": {
-                            "type": "string",
-                            "description": "Code to analyze for security issues"
-                        },
-                        "context": {
-                            "type": "string",
-                            "description": "Security context or requirements",
-                            "default": ""
-                        },
-                        "model": {
-                            "type": "string",
-                            "description": f"Model to use: {available_models}",
-                            "default": self.config.get('default_model', 'Gemini')
-                        }
-                    },
-                    "required": ["code"]
+                    "properties": {key: build_property(key, prop) for key, prop in schema["properties"].items()},
+                    "required": schema["required"]
                 }
             )
+            for schema in _TOOL_SCHEMAS
         ]
     
+    async def _handle_pair(self, arguments: Dict[str, Any]) -> str:
+        """Handle the pair tool"""
+        prompt = arguments['prompt']
+        model = arguments.get('model', self._default_model)
+        temperature = arguments.get('temperature', self._default_temperature)
+        
+        return await self._call_openrouter(prompt, model, temperature)
+    
+    async def _handle_brainstorm(self, arguments: Dict[str, Any]) -> str:
+        """Handle the brainstorm tool"""
+        topic = arguments['topic']
+        constraints = arguments.get('constraints') or ''
+        model = arguments.get('model', self._default_model)
+        constraints_str = f'Constraints/Requirements: {constraints}' if constraints else ''
+        
+        template, temperature = _TEMPLATES["brainstorm"]
+        prompt = template.format_map({"topic": topic, "constraints": constraints_str})
+        
+        return await self._call_openrouter(prompt, model, temperature)
+    
+    async def _review_code(self, name: str, arguments: Dict[str, Any]) -> str:
+        """Shared implementation of the code review tools"""
+        code = arguments['code']
+        model = arguments.get('model', self._default_model)
+        context_str = arguments.get('context') or _CONTEXT_DEFAULTS[name]
+        
+        template, temperature = _TEMPLATES[name]
+        prompt = template.format_map({"code": code, "context": context_str})
+        
+        return await self._call_openrouter(prompt, model, temperature)
+    
+    async def _handle_review(self, arguments: Dict[str, Any]) -> str:
+        """Handle the review tool"""
+        return await self._review_code("review", arguments)
+    
+    async def _handle_review_performance(self, arguments: Dict[str, Any]) -> str:
+        """Handle the review_performance tool"""
+        return await self._review_code("review_performance", arguments)
+    
+    async def _handle_review_security(self, arguments: Dict[str, Any]) -> str:
+        """Handle the review_security tool"""
+        return await self._review_code("review_security", arguments)
+    
     def _setup_handlers(self):
         """Set up request handlers"""
+        self._handlers = {
+            "pair": self._handle_pair,
+            "review": self._handle_review,
+            "brainstorm": self._handle_brainstorm,
+            "review_performance": self._handle_review_performance,
+            "review_security": self._handle_review_security,
+        }
         
         @self.server.list_tools()
         async def list_tools():
@@ -241,120 +513,17 @@ class AIAssistantMCPServer:
         
         @self.server.call_tool()
         async def call_tool(name: str, arguments: Dict[str, Any]) -> list[TextContent]:
-            logger.info(f"Tool called: {name} with model: {arguments.get('model', self.config.get('default_model'))}")
+            model = arguments.get('model', self._default_model)
+            logger.info("Tool called: %s with model: %s", name, model)
             
             try:
-                if name == "pair":
-                    prompt = arguments['prompt']
-                    model = arguments.get('model', self.config.get('default_model'))
-                    temperature = arguments.get('temperature', 0.5)
-                    
-                    response = await self._call_openrouter(prompt, model, temperature)
-                    
-                elif name == "review":
-                    code = arguments['code']
-                    context = arguments.get('context', '')
-                    model = arguments.get('model', self.config.get('default_model'))
-                    
-                    prompt = f"""Please provide a comprehensive code review for the following code.
-
-Context: {context if context else "No additional context provided"}
-
-Code to review:
-```
-{code}
-```
-
-Please analyze:
-1. Code quality and readability
-2. Potential bugs or issues
-3. Performance considerations
-4. Security concerns
-5. Best practices and improvements
-6. Overall architecture and design
-
-Provide specific, actionable feedback with examples where appropriate."""
-                    
-                    response = await self._call_openrouter(prompt, model, temperature=0.3)
-                    
-                elif name == "brainstorm":
-                    topic = arguments['topic']
-                    constraints = arguments.get('constraints', '')
-                    model = arguments.get('model', self.config.get('default_model'))
-                    
-                    prompt = f"""Let's brainstorm creative ideas and solutions for: {topic}
-
-{f'Constraints/Requirements: {constraints}' if constraints else ''}
-
-Please provide:
-1. Multiple creative approaches or solutions
-2. Pros and cons of each approach
-3. Unconventional or innovative ideas
-4. Practical implementation considerations
-5. Potential challenges and how to address them
-
-Be creative and think outside the box!"""
-                    
-                    response = await self._call_openrouter(prompt, model, temperature=0.7)
-                    
-                elif name == "review_performance":
-                    code = arguments['code']
-                    context = arguments.get('context', '')
-                    model = arguments.get('model', self.config.get('default_model'))
-                    
-                    prompt = f"""Please analyze the following code for performance issues and optimization opportunities.
-
-Usage context: {context if context else "General purpose usage"}
-
-Code to analyze:
-```
-{code}
-```
-
-Please identify:
-1. Performance bottlenecks
-2. Time complexity analysis
-3. Space complexity concerns
-4. Optimization opportunities
-5. Caching strategies
-6. Algorithm improvements
-7. Resource usage concerns
-
-Provide specific recommendations with code examples where applicable."""
-                    
-                    response = await self._call_openrouter(prompt, model, temperature=0.3)
-                    
-                elif name == "review_security":
-                    code = arguments['code']
-                    context = arguments.get('context', '')
-                    model = arguments.get('model', self.config.get('default_model'))
-                    
-                    prompt = f"""Please perform a security-focused review of the following code.
-
-Security context: {context if context else "Standard security requirements"}
-
-Code to analyze:
-```
-{code}
-```
-
-Please identify:
-1. Security vulnerabilities (injection, XSS, etc.)
-2. Authentication/authorization issues
-3. Data validation concerns
-4. Cryptographic weaknesses
-5. Information disclosure risks
-6. OWASP Top 10 considerations
-7. Security best practices violations
-
-Provide specific vulnerabilities with severity levels and remediation recommendations."""
-                    
-                    response = await self._call_openrouter(prompt, model, temperature=0.2)
-                    
-                else:
+                handler = self._handlers.get(name)
+                if handler is None:
                     raise JSONRPCError(code=-32601, message=f"Tool '{name}' not found")
                 
-                logger.info(f"Tool {name} completed successfully using model {arguments.get('model', self.config.get('default_model'))}")
+                response = await handler(arguments)
+                
+                logger.info("Tool %s completed successfully using model %s", name, model)
                 
                 return [TextContent(type="text", text=response)]
                 
@@ -368,8 +537,8 @@ Provide specific vulnerabilities with severity levels and remediation recommenda
     async def run(self):
         """Run the MCP server"""
         logger.info("Starting AI Assistant MCP Server...")
-        logger.info(f"Available models: {', '.join(self.config.get('models', {}).keys())}")
-        logger.info(f"Default model: {self.config.get('default_model', 'Gemini')}")
+        logger.info(f"Available models: {self._model_names_str}")
+        logger.info(f"Default model: {self._default_model}")
         
         # Create initialization options
         init_options = InitializationOptions(
@@ -378,12 +547,17 @@ Provide specific vulnerabilities with severity levels and remediation recommenda
             capabilities=ServerCapabilities(tools={})
         )
         
-        async with stdio_server() as (read_stream, write_stream):
-            try:
-                await self.server.run(read_stream, write_stream, init_options)
-            except Exception as e:
-                logger.error(f"Server error: {str(e)}")
-                raise
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                try:
+                    await self.server.run(read_stream, write_stream, init_options)
+                except Exception as e:
+                    logger.error(f"Server error: {str(e)}")
+                    raise
+        finally:
+            if self._http is not None:
+                await self._http.aclose()
+                self._http = None
 
 async def main():
     """Main entry point"""
@@ -397,5 +571,10 @@ async def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(main())
\ No newline at end of file
+    # Use uvloop when available; the loop must be chosen before it starts
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file
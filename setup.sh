@@ -33,11 +33,11 @@ echo "✅ Claude Code CLI found"
 
 # Check Python dependencies
 echo "📦 Checking Python dependencies..."
-if ! python3 -c "import mcp" 2>/dev/null; then
+if ! python3 -c "import mcp, httpx, h2, orjson" 2>/dev/null; then
     echo -e "${YELLOW}Installing required Python packages...${NC}"
-    pip3 install mcp requests || {
+    pip3 install mcp 'httpx[http2]' orjson || {
         echo -e "${RED}❌ Failed to install Python dependencies${NC}"
-        echo "Please run: pip3 install mcp requests"
+        echo "Please run: pip3 install mcp 'httpx[http2]' orjson"
         exit 1
     }
 fi